@@ -759,6 +759,7 @@ class iControlDriver(LBaaSBaseDriver):
             bigip.assured_networks = {}
             bigip.assured_tenant_snat_subnets = {}
             bigip.assured_gateway_subnets = []
+            bigip.assured_tenant_folders = {}
 
             if self.conf.f5_ha_type != 'standalone':
                 self.cluster_manager.disable_auto_sync(
@@ -1082,6 +1083,7 @@ class iControlDriver(LBaaSBaseDriver):
             bigip.assured_networks = {}
             bigip.assured_tenant_snat_subnets = {}
             bigip.assured_gateway_subnets = []
+            bigip.assured_tenant_folders = {}
 
     @serialized('get_all_deployed_loadbalancers')
     @is_operational
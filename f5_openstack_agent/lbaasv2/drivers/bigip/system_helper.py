@@ -13,6 +13,8 @@
 # limitations under the License.
 #
 
+import time
+
 from oslo_log import log as logging
 
 from f5_openstack_agent.lbaasv2.drivers.bigip.network_helper import \
@@ -24,17 +26,31 @@ from f5_openstack_agent.lbaasv2.drivers.bigip.resource_helper \
 
 LOG = logging.getLogger(__name__)
 
+# Seconds a positive folder existence check is trusted.
+FOLDER_EXISTS_CACHE_TTL = 60
+
 
 class SystemHelper(object):
 
     def __init__(self):
         self.exempt_folders = ['/', 'Common']
 
+    @staticmethod
+    def _assured_folders(bigip):
+        # folder name -> time the folder was last seen on this bigip.
+        # Reset by the driver's flush_cache along with the other
+        # bigip.assured_* caches.
+        if not hasattr(bigip, 'assured_tenant_folders'):
+            bigip.assured_tenant_folders = {}
+        return bigip.assured_tenant_folders
+
     def create_folder(self, bigip, folder):
         f = bigip.tm.sys.folders.folder
         f.create(**folder)
+        self._assured_folders(bigip)[folder['name']] = time.time()
 
     def delete_folder(self, bigip, folder_name):
+        self._assured_folders(bigip).pop(folder_name, None)
         f = bigip.tm.sys.folders.folder
         if f.exists(name=folder_name):
             obj = f.load(name=folder_name)
@@ -44,7 +60,29 @@ class SystemHelper(object):
         if folder == 'Common':
             return True
 
-        return bigip.tm.sys.folders.folder.exists(name=folder)
+        exists = bigip.tm.sys.folders.folder.exists(name=folder)
+        if not exists:
+            self._assured_folders(bigip).pop(folder, None)
+        return exists
+
+    def folder_exists_cached(self, bigip, folder,
+                             ttl=FOLDER_EXISTS_CACHE_TTL):
+        """Check folder existence, trusting recent positive results.
+
+        Only positive results are cached because a missing folder is
+        about to be created.  Folders removed behind the agent's back,
+        e.g. by config-sync from another device, are trusted for at
+        most ttl seconds or until the driver flushes its cache.
+        """
+        assured_folders = self._assured_folders(bigip)
+        seen = assured_folders.get(folder)
+        if seen is not None and 0 <= time.time() - seen < ttl:
+            return True
+
+        if self.folder_exists(bigip, folder):
+            assured_folders[folder] = time.time()
+            return True
+        return False
 
     def get_folders(self, bigip):
         f_collection = []
@@ -14,7 +14,15 @@
 # limitations under the License.
 #
 
+import random
+import sys
+import time
+
+from eventlet import greenpool
 from oslo_log import log as logging
+import requests
+from requests import HTTPError
+import six
 
 from f5_openstack_agent.lbaasv2.drivers.bigip import exceptions as f5ex
 from f5_openstack_agent.lbaasv2.drivers.bigip.network_helper import \
@@ -23,6 +31,109 @@ from f5_openstack_agent.lbaasv2.drivers.bigip.system_helper import SystemHelper
 
 LOG = logging.getLogger(__name__)
 
+# HTTP status codes from iControl REST that are considered transient.
+RETRY_STATUS_CODES = (401, 429, 502, 503, 504)
+# Gateway errors are usually brief overloads, so they get more attempts.
+SERVER_ERROR_STATUS_CODES = (502, 503, 504)
+# Transport level errors that are worth retrying.
+RECOVERABLE_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+
+def _get_status_code(err):
+    """Return the HTTP status code of a failed request, or None."""
+    response = getattr(err, 'response', None)
+    if response is None:
+        return None
+    return response.status_code
+
+
+def _get_retry_after(err):
+    """Return the Retry-After header of a failed request, or None."""
+    try:
+        return int(err.response.headers['Retry-After'])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _is_recoverable(err):
+    """Return True if a failed iControl request may succeed on retry.
+
+    Anything else, e.g. a 404 or 409, is a real error and fails fast.
+    """
+    if isinstance(err, HTTPError):
+        return _get_status_code(err) in RETRY_STATUS_CODES
+    return isinstance(err, RECOVERABLE_ERRORS)
+
+
+def _refresh_auth(bigip):
+    """Fetch a new iControl auth token for the bigip session.
+
+    Returns False if the session does not use token authentication or
+    the token could not be refreshed.
+    """
+    try:
+        auth = bigip.icrs.session.auth
+        get_new_token = auth.get_new_token
+    except AttributeError:
+        return False
+
+    try:
+        get_new_token(bigip.hostname)
+    except Exception as err:
+        LOG.warning("Failed to refresh auth token for %s: %s"
+                    % (bigip.hostname, err))
+        return False
+    return True
+
+
+def _retry_with_backoff(func, max_retries=3, base=1.0, cap=30, jitter=0.5,
+                        server_error_retries=5, bigip=None):
+    """Call a delete func, retrying recoverable iControl errors.
+
+    The delay between attempts grows exponentially from base and is
+    stretched by a random jitter factor so that many callers failing
+    together do not retry in lockstep.  A Retry-After header sent with
+    the error takes precedence over the computed delay.  Either way the
+    delay is limited to cap seconds.  On a 401 the
+    auth token of bigip, when given, is refreshed and the request
+    retried without waiting.  A 404 on a retry means an earlier attempt,
+    e.g. one that timed out, already deleted the object, so it counts
+    as success.
+    """
+    attempt = 0
+    while True:
+        try:
+            return func()
+        except Exception as err:
+            status_code = _get_status_code(err)
+            if attempt > 0 and isinstance(err, HTTPError) and \
+                    status_code == 404:
+                LOG.debug("Object already deleted by an earlier attempt.")
+                return None
+            if not _is_recoverable(err):
+                raise
+            if status_code in SERVER_ERROR_STATUS_CODES:
+                retries = server_error_retries
+            else:
+                retries = max_retries
+            if attempt + 1 >= retries:
+                raise
+            attempt += 1
+            if status_code == 401 and bigip is not None and \
+                    _refresh_auth(bigip):
+                LOG.debug("Refreshed auth token for %s, retrying."
+                          % bigip.hostname)
+                continue
+            retry_after = _get_retry_after(err)
+            if retry_after is not None:
+                delay = min(cap, max(0, retry_after))
+            else:
+                delay = min(cap, base * (2 ** (attempt - 1)) *
+                            (1 + random.random() * jitter))
+            LOG.warning("iControl request failed: %s, "
+                        "retrying in %.2f seconds." % (err, delay))
+            time.sleep(delay)
+
 
 class BigipTenantManager(object):
     """Create network connectivity for a bigip."""
@@ -56,7 +167,8 @@ class BigipTenantManager(object):
         folder_name = self.service_adapter.get_folder_name(tenant_id)
         LOG.debug("Creating tenant folder %s" % folder_name)
         for bigip in self.driver.get_config_bigips():
-            if not self.system_helper.folder_exists(bigip, folder_name):
+            if not self.system_helper.folder_exists_cached(bigip,
+                                                           folder_name):
                 folder = self.service_adapter.get_folder(service)
                 # This folder is a dict config obj, that can be passed to
                 # folder.create in the SDK
@@ -92,10 +204,37 @@ class BigipTenantManager(object):
     def assure_tenant_cleanup(self, service, all_subnet_hints):
         """Delete tenant partition."""
         # Called for every bigip only in replication mode,
-        # otherwise called once.
-        for bigip in self.driver.get_config_bigips():
+        # otherwise called once.  Each bigip is cleaned up in its own
+        # greenthread so that one device backing off on a transient
+        # error does not hold up the others.
+        bigips = self.driver.get_config_bigips()
+        if not bigips:
+            return
+        pool = greenpool.GreenPool(len(bigips))
+        threads = []
+        for bigip in bigips:
             subnet_hints = all_subnet_hints[bigip.device_name]
+            threads.append(pool.spawn(self._assure_bigip_tenant_cleanup_safe,
+                                      bigip, service, subnet_hints))
+
+        first_exc_info = None
+        for thread in threads:
+            exc_info = thread.wait()
+            if exc_info is not None and first_exc_info is None:
+                first_exc_info = exc_info
+        if first_exc_info is not None:
+            six.reraise(*first_exc_info)
+
+    def _assure_bigip_tenant_cleanup_safe(self, bigip, service,
+                                          subnet_hints):
+        # Run in a greenthread: log failures with their traceback and
+        # hand the exception info back instead of dying in the hub.
+        try:
             self._assure_bigip_tenant_cleanup(bigip, service, subnet_hints)
+        except Exception:
+            LOG.exception("Tenant cleanup failed on %s" % bigip.hostname)
+            return sys.exc_info()
+        return None
 
     # called for every bigip only in replication mode.
     # otherwise called once
@@ -111,16 +250,19 @@ class BigipTenantManager(object):
                                                                   partition)
         for domain_name in domain_names:
             try:
-                self.network_helper.delete_route_domain(bigip,
-                                                        partition,
-                                                        domain_name)
+                _retry_with_backoff(
+                    lambda: self.network_helper.delete_route_domain(
+                        bigip, partition, domain_name),
+                    bigip=bigip)
             except Exception as err:
                 LOG.error("Failed to delete route domain %s. "
                           "%s. Manual intervention might be required."
                           % (domain_name, err.message))
 
         try:
-            self.system_helper.delete_folder(bigip, partition)
+            _retry_with_backoff(
+                lambda: self.system_helper.delete_folder(bigip, partition),
+                bigip=bigip)
         except Exception as err:
             LOG.warning(
                 "Folder deletion exception for tenant partition %s occurred.\n"
@@ -404,6 +404,17 @@ class TestiControlDriver(TestiControlDriverMocker,
             fully_mocked_target, positive_svc_obj_list,
             '_update_l7policy_status', 'update_l7policy_status')
 
+    def test_flush_cache(self, fully_mocked_target):
+        bigip = Mock()
+        bigip.assured_networks = {'net_UUID': 'tunnel-vxlan-100'}
+        bigip.assured_tenant_folders = {'Project_1': 100}
+        fully_mocked_target.get_all_bigips = Mock(return_value=[bigip])
+
+        fully_mocked_target.flush_cache()
+
+        assert bigip.assured_networks == {}
+        assert bigip.assured_tenant_folders == {}
+
     def test_purge_orphaned_loadbalancer(self, standalone_builder,
                                          fully_mocked_target,
                                          mock_logger,
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# Copyright (c) 2018, F5 Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from mock import Mock
+from mock import patch
+
+from f5_openstack_agent.lbaasv2.drivers.bigip.system_helper import \
+    SystemHelper
+
+
+class TestFolderExistsCache(object):
+
+    @staticmethod
+    def build_bigip(hostname='bigip1', exists=True):
+        bigip = Mock()
+        bigip.hostname = hostname
+        bigip.assured_tenant_folders = {}
+        bigip.tm.sys.folders.folder.exists.return_value = exists
+        return bigip
+
+    @staticmethod
+    def exists_calls(bigip):
+        return bigip.tm.sys.folders.folder.exists.call_count
+
+    def test_folder_exists_cached(self):
+        target = SystemHelper()
+        bigip1 = self.build_bigip('bigip1')
+        bigip2 = self.build_bigip('bigip2')
+
+        assert target.folder_exists_cached(bigip1, 'Project_1')
+        assert target.folder_exists_cached(bigip1, 'Project_1')
+        assert self.exists_calls(bigip1) == 1
+
+        assert target.folder_exists_cached(bigip2, 'Project_1')
+        assert self.exists_calls(bigip2) == 1
+
+    def test_folder_missing_not_cached(self):
+        target = SystemHelper()
+        bigip = self.build_bigip(exists=False)
+
+        assert not target.folder_exists_cached(bigip, 'Project_1')
+        assert not target.folder_exists_cached(bigip, 'Project_1')
+        assert self.exists_calls(bigip) == 2
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.system_helper.'
+           'time.time')
+    def test_folder_exists_cache_expires(self, m_time):
+        target = SystemHelper()
+        bigip = self.build_bigip()
+
+        m_time.return_value = 100
+        target.folder_exists_cached(bigip, 'Project_1', ttl=60)
+        m_time.return_value = 161
+        target.folder_exists_cached(bigip, 'Project_1', ttl=60)
+        assert self.exists_calls(bigip) == 2
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.system_helper.'
+           'time.time')
+    def test_folder_exists_cache_clock_stepped_back(self, m_time):
+        target = SystemHelper()
+        bigip = self.build_bigip()
+
+        m_time.return_value = 100
+        target.folder_exists_cached(bigip, 'Project_1', ttl=60)
+        m_time.return_value = 50
+        target.folder_exists_cached(bigip, 'Project_1', ttl=60)
+        assert self.exists_calls(bigip) == 2
+
+    def test_folder_missing_drops_cached_folder(self):
+        target = SystemHelper()
+        bigip = self.build_bigip()
+
+        assert target.folder_exists_cached(bigip, 'Project_1')
+        bigip.tm.sys.folders.folder.exists.return_value = False
+        assert not target.folder_exists(bigip, 'Project_1')
+
+        assert not target.folder_exists_cached(bigip, 'Project_1')
+        assert self.exists_calls(bigip) == 3
+
+    def test_flushed_cache_rechecks_folder(self):
+        target = SystemHelper()
+        bigip = self.build_bigip()
+
+        target.folder_exists_cached(bigip, 'Project_1')
+        bigip.assured_tenant_folders = {}
+        target.folder_exists_cached(bigip, 'Project_1')
+
+        assert self.exists_calls(bigip) == 2
+
+    def test_create_folder_caches_folder(self):
+        target = SystemHelper()
+        bigip = self.build_bigip()
+
+        target.create_folder(bigip, {'name': 'Project_1'})
+
+        assert target.folder_exists_cached(bigip, 'Project_1')
+        assert self.exists_calls(bigip) == 0
+
+    def test_delete_folder_on_any_helper_drops_cached_folder(self):
+        target = SystemHelper()
+        purger = SystemHelper()
+        bigip = self.build_bigip()
+
+        target.folder_exists_cached(bigip, 'Project_1')
+        purger.purge_folder(bigip, 'Project_1')
+        target.folder_exists_cached(bigip, 'Project_1')
+
+        # purge_folder checks existence once itself
+        assert self.exists_calls(bigip) == 3
@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# Copyright (c) 2018, F5 Networks, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+
+from eventlet import event
+from eventlet import Timeout
+import pytest
+
+from mock import Mock
+from mock import patch
+import requests
+from requests import HTTPError
+
+from f5_openstack_agent.lbaasv2.drivers.bigip import tenants
+
+
+def http_error(status_code, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    return HTTPError(response=response)
+
+
+class TestRetryWithBackoff(object):
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_retry_then_succeed(self, m_sleep):
+        func = Mock(side_effect=[http_error(401), 'done'])
+
+        assert tenants._retry_with_backoff(func) == 'done'
+        assert func.call_count == 2
+        assert m_sleep.call_count == 1
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_retry_exhausted(self, m_sleep):
+        func = Mock(side_effect=http_error(401))
+
+        with pytest.raises(HTTPError):
+            tenants._retry_with_backoff(func, max_retries=3)
+        assert func.call_count == 3
+        assert m_sleep.call_count == 2
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_server_error_retries_longer(self, m_sleep):
+        for status_code in (502, 503, 504):
+            func = Mock(side_effect=http_error(status_code))
+
+            with pytest.raises(HTTPError):
+                tenants._retry_with_backoff(func, max_retries=3,
+                                            server_error_retries=5)
+            assert func.call_count == 5
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_retry_after_header(self, m_sleep):
+        func = Mock(side_effect=[
+            http_error(503, headers={'Retry-After': '7'}), 'done'])
+
+        assert tenants._retry_with_backoff(func) == 'done'
+        m_sleep.assert_called_once_with(7)
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_retry_after_header_is_capped(self, m_sleep):
+        func = Mock(side_effect=[
+            http_error(503, headers={'Retry-After': '3600'}), 'done'])
+
+        assert tenants._retry_with_backoff(func, cap=30) == 'done'
+        m_sleep.assert_called_once_with(30)
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_negative_retry_after_header(self, m_sleep):
+        func = Mock(side_effect=[
+            http_error(503, headers={'Retry-After': '-5'}), 'done'])
+
+        assert tenants._retry_with_backoff(func) == 'done'
+        m_sleep.assert_called_once_with(0)
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_401_refreshes_token(self, m_sleep):
+        bigip = Mock()
+        bigip.hostname = 'bigip1'
+        func = Mock(side_effect=[http_error(401), 'done'])
+
+        assert tenants._retry_with_backoff(func, bigip=bigip) == 'done'
+        bigip.icrs.session.auth.get_new_token.assert_called_once_with(
+            'bigip1')
+        assert not m_sleep.called
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_401_sleeps_when_refresh_fails(self, m_sleep):
+        bigip = Mock()
+        bigip.icrs.session.auth.get_new_token.side_effect = \
+            http_error(401)
+        func = Mock(side_effect=[http_error(401), 'done'])
+
+        assert tenants._retry_with_backoff(func, bigip=bigip) == 'done'
+        assert m_sleep.call_count == 1
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_no_retry_on_other_status(self, m_sleep):
+        func = Mock(side_effect=http_error(404))
+
+        with pytest.raises(HTTPError):
+            tenants._retry_with_backoff(func)
+        assert func.call_count == 1
+        assert not m_sleep.called
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_retry_transport_errors(self, m_sleep):
+        func = Mock(side_effect=[requests.ConnectionError('reset'),
+                                 requests.ReadTimeout('timeout'), 'done'])
+
+        assert tenants._retry_with_backoff(func) == 'done'
+        assert func.call_count == 3
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_404_after_timeout_is_success(self, m_sleep):
+        func = Mock(side_effect=[requests.ReadTimeout('timeout'),
+                                 http_error(404)])
+
+        assert tenants._retry_with_backoff(func) is None
+        assert func.call_count == 2
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_no_retry_on_unrecoverable_error(self, m_sleep):
+        func = Mock(side_effect=ValueError('bug'))
+
+        with pytest.raises(ValueError):
+            tenants._retry_with_backoff(func)
+        assert func.call_count == 1
+        assert not m_sleep.called
+
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.random.random')
+    @patch('f5_openstack_agent.lbaasv2.drivers.bigip.tenants.time.sleep')
+    def test_backoff_delay_is_capped(self, m_sleep, m_random):
+        m_random.return_value = 1.0
+        func = Mock(side_effect=[http_error(429)] * 3 + ['done'])
+
+        tenants._retry_with_backoff(func, max_retries=4, base=1.0, cap=3,
+                                    jitter=0.5)
+        delays = [c[0][0] for c in m_sleep.call_args_list]
+        assert delays == [1.5, 3.0, 3]
+
+
+class TestBigipTenantManager(object):
+
+    @staticmethod
+    def build_target():
+        target = tenants.BigipTenantManager(Mock(), Mock())
+        target.system_helper = Mock()
+        target.network_helper = Mock()
+        return target
+
+    @staticmethod
+    def build_bigip(hostname='bigip1'):
+        bigip = Mock()
+        bigip.hostname = hostname
+        return bigip
+
+    def test_assure_tenant_created_checks_cached_folder(self):
+        target = self.build_target()
+        bigip = self.build_bigip()
+        target.conf.use_namespaces = False
+        target.driver.get_config_bigips.return_value = [bigip]
+        target.driver.service_to_traffic_group.return_value = 'traffic-group-1'
+        target.service_adapter.get_folder_name.return_value = 'Project_1'
+        target.system_helper.folder_exists_cached.return_value = False
+        service = {'loadbalancer': {'tenant_id': '1'}}
+
+        target.assure_tenant_created(service)
+
+        target.system_helper.folder_exists_cached.assert_called_once_with(
+            bigip, 'Project_1')
+        assert target.system_helper.create_folder.call_count == 1
+
+    def test_remove_tenant_deletes_route_domains_and_folder(self):
+        target = self.build_target()
+        bigip = self.build_bigip()
+        target.service_adapter.get_folder_name.return_value = 'Project_1'
+        target.network_helper.get_route_domain_names.return_value = [
+            'Project_1', 'Project_1_aux_2']
+
+        target._remove_tenant_replication_mode(bigip, '1')
+
+        assert target.network_helper.delete_route_domain.call_count == 2
+        target.network_helper.delete_route_domain.assert_any_call(
+            bigip, 'Project_1', 'Project_1_aux_2')
+        target.system_helper.delete_folder.assert_called_once_with(
+            bigip, 'Project_1')
+
+    def test_assure_tenant_cleanup_all_bigips(self):
+        target = self.build_target()
+        bigips = [self.build_bigip('bigip1'), self.build_bigip('bigip2')]
+        for bigip in bigips:
+            bigip.device_name = bigip.hostname
+        target.driver.get_config_bigips.return_value = bigips
+        target._assure_bigip_tenant_cleanup = Mock(
+            side_effect=[Exception('bigip1 failed'), None])
+        service = {'loadbalancer': {'tenant_id': '1'}}
+        hints = {'bigip1': 'hints1', 'bigip2': 'hints2'}
+
+        with pytest.raises(Exception) as err:
+            target.assure_tenant_cleanup(service, hints)
+
+        assert 'bigip1 failed' in str(err.value)
+        assert target._assure_bigip_tenant_cleanup.call_count == 2
+        target._assure_bigip_tenant_cleanup.assert_any_call(
+            bigips[1], service, 'hints2')
+
+    def test_assure_tenant_cleanup_runs_concurrently(self):
+        target = self.build_target()
+        bigips = [self.build_bigip('bigip1'), self.build_bigip('bigip2')]
+        for bigip in bigips:
+            bigip.device_name = bigip.hostname
+        target.driver.get_config_bigips.return_value = bigips
+        bigip2_cleaned = event.Event()
+
+        def cleanup(bigip, service, subnet_hints):
+            # bigip1 blocks until bigip2 has been cleaned up, which
+            # only happens if the two run concurrently.
+            if bigip.hostname == 'bigip1':
+                with Timeout(5):
+                    bigip2_cleaned.wait()
+            else:
+                bigip2_cleaned.send(True)
+
+        target._assure_bigip_tenant_cleanup = Mock(side_effect=cleanup)
+        service = {'loadbalancer': {'tenant_id': '1'}}
+        hints = {'bigip1': 'hints1', 'bigip2': 'hints2'}
+
+        target.assure_tenant_cleanup(service, hints)
+
+        assert bigip2_cleaned.ready()